@@ -0,0 +1,29 @@
+"""
+Ahead-of-time compile the indicator kernels into a 'ta_kernels' extension.
+
+Run once per environment:
+
+    python aot_build.py
+
+The generated ta_kernels extension (.so/.pyd) must sit next to
+technical_indicators.py, which imports it in preference to JIT-compiling
+the kernels. This removes the per-process numba compile cost, which
+dominates short runs (CI, cron jobs over a handful of symbols).
+"""
+from numba.pycc import CC
+
+from technical_indicators import _fast_bbands_py, _compute_all_py, _bb_w20_py
+
+cc = CC('ta_kernels')
+
+# float32 is the native dtype produced by the loader; the float64 variants
+# cover data coming from other sources
+cc.export('fast_bbands_f4', 'UniTuple(f8[:], 3)(f4[:], i8, f8)')(_fast_bbands_py)
+cc.export('fast_bbands_f8', 'UniTuple(f8[:], 3)(f8[:], i8, f8)')(_fast_bbands_py)
+cc.export('compute_all_f4', 'UniTuple(f8[:], 8)(f4[:])')(_compute_all_py)
+cc.export('compute_all_f8', 'UniTuple(f8[:], 8)(f8[:])')(_compute_all_py)
+cc.export('bb_w20_f4', 'UniTuple(f8[:], 3)(f4[:], f8)')(_bb_w20_py)
+cc.export('bb_w20_f8', 'UniTuple(f8[:], 3)(f8[:], f8)')(_bb_w20_py)
+
+if __name__ == '__main__':
+    cc.compile()
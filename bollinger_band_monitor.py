@@ -1,157 +1,45 @@
-<<<<<<< HEAD
 from data_loader import DataLoader
-from technical_indicators import TechnicalIndicators
+from technical_indicators import (TechnicalIndicators, EVENT_ABOVE_UPPER,
+                                  EVENT_TYPE_LABELS)
+import numpy as np
 import pandas as pd
 import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
+import argparse
 
-def monitor_bollinger_bands(root_dir, file_pattern='.us.txt', log_level=1):
+def analyze_file(loader, file_path, months_lookback, log_level=1):
     """
-    Monitor stock price movements relative to 3-sigma Bollinger Bands for multiple stocks.
-    
-    Parameters:
-    root_dir (str): Root directory to search for data files
-    file_pattern (str): Pattern to match data files (default: '.us.txt')
-    log_level (int): Logging detail level (1=minimal [default], 2=medium, 3=detailed)
+    Load one data file and run the technical analysis on it.
+
+    Runs on a worker thread; pandas/NumPy release the GIL in their C
+    rolling/ewm kernels, so independent files overlap on multiple cores.
+
+    Returns:
+    tuple: (data, ti, events) for use by the main (logging) thread
     """
-    crossing_details = {}
-    files_processed = 0
-    files_with_errors = 0
-    start_time = time.time()  # Start timing
-    
-    try:
-        # Initialize data loader
-        loader = DataLoader(root_dir, file_pattern)
-        logger = loader.logger
-        total_files = len(loader.data_files)
-        
-        logger.info(f"\nStarting analysis of {total_files} files...")
-        
-        # Process each data file
-        for symbol, data in loader.load_all_data():
-            files_processed += 1
-            progress_pct = (files_processed / total_files) * 100
-            
-            # Level 1: Show progress percentage every 5 files or at completion
-            if log_level == 1:
-                if files_processed % 5 == 0 or files_processed == total_files:
-                    logger.info(f"Progress: {progress_pct:.1f}% ({files_processed}/{total_files})")
-            
-            # Level 2 & 3: Show detailed progress
-            else:
-                logger.info("\n" + "="*80)
-                logger.info(f"Analyzing {symbol} ({files_processed}/{total_files})")
-                logger.info("="*80)
-                
-                if log_level == 3:
-                    logger.info("Data Overview:")
-                    logger.info(f"Columns available: {data.columns.tolist()}")
-                    logger.info(f"\nAnalysis period:")
-                    logger.info(f"From: {data.index[0].strftime('%Y-%m-%d')}")
-                    logger.info(f"To:   {data.index[-1].strftime('%Y-%m-%d')}")
-            
-            # Technical Analysis
-            try:
-                ti = TechnicalIndicators(data)
-                data['SMA_20'] = ti.sma(20)
-                data['EMA_20'] = ti.ema(20)
-                data['RSI'] = ti.rsi()
-                macd_data = ti.macd()
-                data = pd.concat([data, macd_data], axis=1)
-                bb_data = ti.bollinger_bands()
-                data = pd.concat([data, bb_data], axis=1)
-                
-                events = ti.check_recent_bb_crossings(months=2)
-                if events:
-                    crossing_details[symbol] = events
-                    
-                if log_level == 3:
-                    logger.info(f"\nAnalyzing price movements outside 3-sigma Bollinger Bands for {symbol}...")
-                    ti.print_bb_crossings(months=2, logger=logger)
-                
-            except Exception as e:
-                files_with_errors += 1
-                if log_level >= 2:
-                    logger.error(f"Error in technical analysis for {symbol}: {str(e)}")
-                continue
-        
-        # Calculate elapsed time
-        end_time = time.time()
-        elapsed_time = timedelta(seconds=int(end_time - start_time))
-        
-        # Summary section
-        logger.info("\n" + "="*80)
-        logger.info("ANALYSIS SUMMARY")
-        logger.info("="*80)
-        logger.info(f"\nTotal run time: {elapsed_time}")
-        
-        # Level 2 & 3: Show processing statistics
-        if log_level >= 2:
-            logger.info("\nProcessing Statistics:")
-            logger.info(f"Total files found:     {total_files}")
-            logger.info(f"Files processed:       {files_processed}")
-            logger.info(f"Files with errors:     {files_with_errors}")
-            logger.info(f"Successful analysis:   {files_processed - files_with_errors}")
-        
-        # All levels: Show crossing summary without timestamps
-        if crossing_details:
-            logger.info("\nStocks with Bollinger Band crossings in the last 2 months:")
-            
-            if log_level == 1:
-                for symbol, events in crossing_details.items():
-                    sorted_events = sorted(events, key=lambda x: x['date'])
-                    crossing_sequence = []
-                    for event in sorted_events:
-                        if 'Above' in event['type']:
-                            crossing_sequence.append('up')
-                        else:
-                            crossing_sequence.append('down')
-                    sequence_str = ', '.join(crossing_sequence)
-                    logger.info(f"{symbol}: {sequence_str}")
-            
-            elif log_level == 2:
-                for symbol, events in crossing_details.items():
-                    logger.info(f"\n{symbol}:")
-                    for event in events:
-                        date_str = event['date'].strftime('%Y-%m-%d')
-                        logger.info(f"  {date_str} - {event['type']}")
-            
-            else:  # level 3
-                logger.info("-" * 120)
-                for symbol, events in crossing_details.items():
-                    logger.info(f"\n{symbol}:")
-                    for event in events:
-                        date_str = event['date'].strftime('%Y-%m-%d')
-                        logger.info(f"  {date_str} - {event['type']} "
-                                   f"(Price: {event['price']:.2f}, "
-                                   f"Band: {event['band_value']:.2f}, "
-                                   f"Deviation: {event['deviation']:.2f}%)")
-            
-            logger.info(f"\nTotal: {len(crossing_details)} out of {files_processed} "
-                       f"stocks ({(len(crossing_details)/files_processed)*100:.1f}%) "
-                       f"showed significant price movements")
-        else:
-            logger.info("\nNo stocks found with Bollinger Band crossings in the last 2 months "
-                       f"out of {files_processed} stocks analyzed.")
-            
-    except Exception as e:
-        logger.error(f"Error in data processing: {str(e)}")
-        return
+    data = loader.load_data(file_path)
+    ti = TechnicalIndicators(data)
+    # The indicator columns are only ever shown by the level-3 data
+    # overview; crossing detection needs none of them, so skip the work
+    # at lower levels
+    if log_level == 3:
+        data['SMA_20'] = ti.sma(20)
+        data['EMA_20'] = ti.ema(20)
+        data['RSI'] = ti.rsi()
+        # Assign new columns in place - pd.concat would reallocate and copy
+        # every existing column just to append these
+        macd_data = ti.macd()
+        for col in macd_data.columns:
+            data[col] = macd_data[col].to_numpy()
+        bb_data = ti.bollinger_bands()
+        for col in bb_data.columns:
+            data[col] = bb_data[col].to_numpy()
 
-if __name__ == "__main__":
-    # Updated root directory after reorganizing folders
-    #root_directory = r"C:\Users\simon\Downloads\a\llm_projects\stock_project\d_us_txt__mini"
-    root_directory = r"C:\Users\simon\Downloads\a\ml_applications\stock_project\d_us_text__mini"
-    monitor_bollinger_bands(root_directory, log_level=1)
-=======
-from data_loader import DataLoader
-from technical_indicators import TechnicalIndicators
-import pandas as pd
-import logging
-import time
-from datetime import timedelta
-import argparse
+    events = ti.check_recent_bb_crossings(months=months_lookback)
+    return data, ti, events
 
 def monitor_bollinger_bands(root_dir, file_pattern='.us.txt', log_level=1, months_lookback=1):
     """
@@ -177,53 +65,53 @@ def monitor_bollinger_bands(root_dir, file_pattern='.us.txt', log_level=1, month
         logger.info(f"\nStarting analysis of {total_files} files...")
         logger.info(f"Looking back {months_lookback} months for Bollinger Band crossings")
         
-        # Process files...
-        for symbol, data in loader.load_all_data():
-            files_processed += 1
-            progress_pct = (files_processed / total_files) * 100
-            
-            # Level 1: Show progress percentage every 5 files or at completion
-            if log_level == 1:
-                if files_processed % 5 == 0 or files_processed == total_files:
-                    logger.info(f"Progress: {progress_pct:.1f}% ({files_processed}/{total_files})")
-            
-            # Level 2 & 3: Show detailed progress
-            else:
-                logger.info("\n" + "="*80)
-                logger.info(f"Analyzing {symbol} ({files_processed}/{total_files})")
-                logger.info("="*80)
-                
-                if log_level == 3:
-                    logger.info("Data Overview:")
-                    logger.info(f"Columns available: {data.columns.tolist()}")
-                    logger.info(f"\nAnalysis period:")
-                    logger.info(f"From: {data.index[0].strftime('%Y-%m-%d')}")
-                    logger.info(f"To:   {data.index[-1].strftime('%Y-%m-%d')}")
-            
-            # Technical Analysis
-            try:
-                ti = TechnicalIndicators(data)
-                data['SMA_20'] = ti.sma(20)
-                data['EMA_20'] = ti.ema(20)
-                data['RSI'] = ti.rsi()
-                macd_data = ti.macd()
-                data = pd.concat([data, macd_data], axis=1)
-                bb_data = ti.bollinger_bands()
-                data = pd.concat([data, bb_data], axis=1)
-                
-                events = ti.check_recent_bb_crossings(months=months_lookback)
-                if events:
+        # Process files in parallel - each file is independent, so analysis
+        # is farmed out to worker threads while logging stays on this thread
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {
+                executor.submit(analyze_file, loader, file_path, months_lookback, log_level): file_path
+                for file_path in loader.data_files
+            }
+
+            for future in as_completed(futures):
+                symbol = futures[future].stem
+                files_processed += 1
+                progress_pct = (files_processed / total_files) * 100
+
+                try:
+                    data, ti, events = future.result()
+                except Exception as e:
+                    files_with_errors += 1
+                    if log_level >= 2:
+                        logger.error("Error in technical analysis for %s: %s", symbol, e)
+                    continue
+
+                # Level 1: Show progress percentage every 5 files or at completion
+                if log_level == 1:
+                    if files_processed % 5 == 0 or files_processed == total_files:
+                        logger.info("Progress: %.1f%% (%d/%d)", progress_pct,
+                                    files_processed, total_files)
+
+                # Level 2 & 3: Show detailed progress
+                else:
+                    logger.info("\n" + "="*80)
+                    logger.info("Analyzing %s (%d/%d)", symbol,
+                                files_processed, total_files)
+                    logger.info("="*80)
+
+                    if log_level == 3:
+                        logger.info("Data Overview:")
+                        logger.info("Columns available: %s", data.columns.tolist())
+                        logger.info("\nAnalysis period:")
+                        logger.info("From: %s", data.index[0].strftime('%Y-%m-%d'))
+                        logger.info("To:   %s", data.index[-1].strftime('%Y-%m-%d'))
+
+                if len(events['date']):
                     crossing_details[symbol] = events
-                    
+
                 if log_level == 3:
-                    logger.info(f"\nAnalyzing price movements outside 3-sigma Bollinger Bands for {symbol}...")
+                    logger.info("\nAnalyzing price movements outside 3-sigma Bollinger Bands for %s...", symbol)
                     ti.print_bb_crossings(months=months_lookback, logger=logger)
-                
-            except Exception as e:
-                files_with_errors += 1
-                if log_level >= 2:
-                    logger.error(f"Error in technical analysis for {symbol}: {str(e)}")
-                continue
         
         # Calculate elapsed time
         end_time = time.time()
@@ -252,33 +140,33 @@ def monitor_bollinger_bands(root_dir, file_pattern='.us.txt', log_level=1, month
             
             if log_level == 1:
                 for symbol, events in crossing_details.items():
-                    sorted_events = sorted(events, key=lambda x: x['date'])
-                    crossing_sequence = []
-                    for event in sorted_events:
-                        if 'Above' in event['type']:
-                            crossing_sequence.append('up')
-                        else:
-                            crossing_sequence.append('down')
+                    # Events arrive most recent first; replay them oldest
+                    # first for the up/down sequence (stable argsort keeps
+                    # same-day ordering)
+                    order = np.argsort(events['date'].to_numpy(), kind='stable')
+                    kinds = events['type'][order]
+                    crossing_sequence = np.where(kinds == EVENT_ABOVE_UPPER,
+                                                 'up', 'down').tolist()
                     sequence_str = ', '.join(crossing_sequence)
-                    logger.info(f"{symbol}: {sequence_str}")
-            
+                    logger.info("%s: %s", symbol, sequence_str)
+
             elif log_level == 2:
                 for symbol, events in crossing_details.items():
-                    logger.info(f"\n{symbol}:")
-                    for event in events:
-                        date_str = event['date'].strftime('%Y-%m-%d')
-                        logger.info(f"  {date_str} - {event['type']}")
-            
+                    logger.info("\n%s:", symbol)
+                    for i in range(len(events['date'])):
+                        date_str = events['date'][i].strftime('%Y-%m-%d')
+                        logger.info("  %s - %s", date_str, EVENT_TYPE_LABELS[events['type'][i]])
+
             else:  # level 3
                 logger.info("-" * 120)
                 for symbol, events in crossing_details.items():
-                    logger.info(f"\n{symbol}:")
-                    for event in events:
-                        date_str = event['date'].strftime('%Y-%m-%d')
-                        logger.info(f"  {date_str} - {event['type']} "
-                                   f"(Price: {event['price']:.2f}, "
-                                   f"Band: {event['band_value']:.2f}, "
-                                   f"Deviation: {event['deviation']:.2f}%)")
+                    logger.info("\n%s:", symbol)
+                    for i in range(len(events['date'])):
+                        date_str = events['date'][i].strftime('%Y-%m-%d')
+                        logger.info("  %s - %s (Price: %.2f, Band: %.2f, Deviation: %.2f%%)",
+                                   date_str, EVENT_TYPE_LABELS[events['type'][i]],
+                                   events['price'][i], events['band_value'][i],
+                                   events['deviation'][i])
             
             logger.info(f"\nTotal: {len(crossing_details)} out of {files_processed} "
                        f"stocks ({(len(crossing_details)/files_processed)*100:.1f}%) "
@@ -294,5 +182,4 @@ def monitor_bollinger_bands(root_dir, file_pattern='.us.txt', log_level=1, month
 if __name__ == "__main__":
     root_directory = r"C:\Users\simon\Downloads\a\llm_projects\stock_project\d_us_txt__mini"
     monitor_bollinger_bands(root_directory,  months_lookback=2, log_level=1)
->>>>>>> e46b2bba6c68a9edac839545b3a5ad8f0efac8b2
   
\ No newline at end of file
@@ -1,204 +1,262 @@
-<<<<<<< HEAD
 import numpy as np
 import pandas as pd
-### TODO: To add comprehensive key, values for all optional parameters.
-class TechnicalIndicators:
-    def __init__(self, data):
-        """
-        Initialize with a pandas DataFrame containing at least 'close' prices
-        :param data: DataFrame with columns including ['close']
-        """
-        self.data = data
-        
-    def sma(self, period=20):
-        """
-        Simple Moving Average
-        """
-        return self.data['close'].rolling(window=period).mean()
-    
-    def ema(self, period=20):
-        """
-        Exponential Moving Average
-        """
-        return self.data['close'].ewm(span=period, adjust=False).mean()
-    
-    def rsi(self, period=14):
-        """
-        Relative Strength Index
-        """
-        delta = self.data['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-    
-    def macd(self, fast_period=12, slow_period=26, signal_period=9):
-        """
-        Moving Average Convergence Divergence
-        """
-        fast_ema = self.data['close'].ewm(span=fast_period, adjust=False).mean()
-        slow_ema = self.data['close'].ewm(span=slow_period, adjust=False).mean()
-        macd_line = fast_ema - slow_ema
-        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-        macd_histogram = macd_line - signal_line
-        
-        return pd.DataFrame({
-            'macd_line': macd_line,
-            'signal_line': signal_line,
-            'macd_histogram': macd_histogram
-        })
-    
-    def bollinger_bands(self, window=20, std_dev=3):
-        """
-        Calculate Bollinger Bands
-        
-        Parameters:
-        window (int): The window for moving average, default is 20
-        std_dev (int): Number of standard deviations, default is 3
-        
-        Returns:
-        DataFrame with Upper and Lower Bollinger Bands
-        """
-        sma = self.data['close'].rolling(window=window).mean()
-        rolling_std = self.data['close'].rolling(window=window).std()
-        
-        upper_band = sma + (rolling_std * std_dev)
-        lower_band = sma - (rolling_std * std_dev)
-        
-        return pd.DataFrame({
-            'BB_Upper': upper_band,
-            'BB_Lower': lower_band
-        })
-    
-    def stochastic_oscillator(self, period=14):
-        """
-        Stochastic Oscillator
-        """
-        low_min = self.data['low'].rolling(window=period).min()
-        high_max = self.data['high'].rolling(window=period).max()
-        
-        k = 100 * ((self.data['close'] - low_min) / (high_max - low_min))
-        d = k.rolling(window=3).mean()
-        
-        return pd.DataFrame({
-            'k_line': k,
-            'd_line': d
-        })
-    
-    def check_recent_bb_crossings(self, months=2):
-        """
-        Check for recent instances where price range intersects with 3-sigma Bollinger Bands
-        
-        Parameters:
-        months (int): Number of recent months to check, default is 2
-        
-        Returns:
-        List of dictionaries containing band intersection information
-        """
-        # Calculate cutoff date for recent data
-        last_date = self.data.index[-1]
-        cutoff_date = last_date - pd.DateOffset(months=months)
-        
-        # Get recent data
-        recent_data = self.data[self.data.index >= cutoff_date].copy()
-        
-        # Calculate Bollinger Bands if not already done
-        bb_data = self.bollinger_bands()
-        recent_bb = bb_data[bb_data.index >= cutoff_date]
-        
-        events = []
-        
-        # Check each day for price range vs bands
-        for i in range(len(recent_data)):
-            date = recent_data.index[i]
-            
-            # Get daily price range
-            daily_high = recent_data['high'].iloc[i]
-            daily_low = recent_data['low'].iloc[i]
-            daily_open = recent_data['open'].iloc[i]
-            daily_close = recent_data['close'].iloc[i]
-            
-            # Get band values
-            upper_band = recent_bb['BB_Upper'].iloc[i]
-            lower_band = recent_bb['BB_Lower'].iloc[i]
-            
-            # Check upper band
-            if max(daily_high, daily_open, daily_close) > upper_band:
-                max_price = max(daily_high, daily_open, daily_close)
-                deviation = ((max_price - upper_band) / upper_band) * 100
-                events.append({
-                    'date': date,
-                    'type': 'Above upper band',
-                    'price': max_price,
-                    'band_value': upper_band,
-                    'deviation': deviation,
-                    'description': (f"Price range extended above upper 3-sigma band. "
-                                  f"High: {daily_high:.2f}, Open: {daily_open:.2f}, Close: {daily_close:.2f}")
-                })
-            
-            # Check lower band
-            if min(daily_low, daily_open, daily_close) < lower_band:
-                min_price = min(daily_low, daily_open, daily_close)
-                deviation = ((min_price - lower_band) / lower_band) * 100
-                events.append({
-                    'date': date,
-                    'type': 'Below lower band',
-                    'price': min_price,
-                    'band_value': lower_band,
-                    'deviation': deviation,
-                    'description': (f"Price range extended below lower 3-sigma band. "
-                                  f"Low: {daily_low:.2f}, Open: {daily_open:.2f}, Close: {daily_close:.2f}")
-                })
-        
-        # Sort events by date (most recent first)
-        events.sort(key=lambda x: x['date'], reverse=True)
-        
-        return events
-    
-    def print_bb_crossings(self, months=2, logger=None):
-        """
-        Print recent Bollinger Band intersections in a formatted way
-        """
-        events = self.check_recent_bb_crossings(months)
-        
-        # Get the date range for the analysis
-        last_date = self.data.index[-1].strftime('%Y-%m-%d')
-        start_date = (self.data.index[-1] - pd.DateOffset(months=months)).strftime('%Y-%m-%d')
-        
-        if not events:
-            message = f"\nNo price points outside Bollinger Band (3-sigma) range found between {start_date} and {last_date}"
-            if logger:
-                logger.info(message)
-            else:
-                print(message)
-            return
-        
-        header = f"\nPrices Outside Bollinger Band Range between {start_date} and {last_date}:"
-        separator = "-" * 120
-        format_header = f"{'Date':<12} {'Type':<25} {'Price':<10} {'Band Value':<12} {'% Deviation':<12} {'Description'}"
-        
-        if logger:
-            logger.info(header)
-            logger.info(separator)
-            logger.info(format_header)
-            logger.info(separator)
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Numeric codes for the event 'type' field; index into EVENT_TYPE_LABELS
+# for display. Events carry the raw prices and are only formatted into
+# strings on the print path, so runs that never display them (log_level 1)
+# skip the allocation entirely.
+EVENT_ABOVE_UPPER = 0
+EVENT_BELOW_LOWER = 1
+EVENT_TYPE_LABELS = ('Above upper band', 'Below lower band')
+
+
+def event_description(events, i):
+    """Build the human-readable description for crossing event i"""
+    if events['type'][i] == EVENT_ABOVE_UPPER:
+        return (f"Price range extended above upper 3-sigma band. "
+                f"High: {events['high'][i]:.2f}, Open: {events['open'][i]:.2f}, "
+                f"Close: {events['close'][i]:.2f}")
+    return (f"Price range extended below lower 3-sigma band. "
+            f"Low: {events['low'][i]:.2f}, Open: {events['open'][i]:.2f}, "
+            f"Close: {events['close'][i]:.2f}")
+
+
+def _fast_bbands(close, window, std_dev):
+    """
+    Single-pass SMA + rolling std over the close array using running sums,
+    replacing the O(N*W) rolling().mean()/.std() recomputation.
+
+    Returns (sma, upper_band, lower_band) arrays with NaN warm-up values,
+    matching pandas rolling output (std uses ddof=1).
+    """
+    n = close.shape[0]
+    sma = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        c = close[i]
+        s += c
+        s2 += c * c
+        if i >= window:
+            old = close[i - window]
+            s -= old
+            s2 -= old * old
+        if i >= window - 1:
+            mean = s / window
+            var = (s2 - s * s / window) / (window - 1)
+            if var < 1e-10 * mean * mean:
+                # s2 - s*s/w cancels catastrophically when the window is
+                # near-constant; recompute this window exactly (rare)
+                d2 = 0.0
+                for j in range(i - window + 1, i + 1):
+                    d = close[j] - mean
+                    d2 += d * d
+                var = d2 / (window - 1)
+            std = np.sqrt(var)
+            sma[i] = mean
+            upper[i] = mean + std * std_dev
+            lower[i] = mean - std * std_dev
+
+    return sma, upper, lower
+
+def _compute_all(close):
+    """
+    Fused single pass over the close array computing every default-parameter
+    indicator at once: SMA(20), EMA(20), RSI(14), MACD(12/26/9) and the
+    3-sigma Bollinger Bands on window 20. The separate per-indicator passes
+    each re-read close from memory; fusing them moves the bytes once.
+
+    Returns (sma20, ema20, rsi14, macd_line, signal_line, macd_histogram,
+    bb_upper, bb_lower) arrays with the same NaN warm-ups as the pandas
+    rolling/ewm equivalents.
+    """
+    n = close.shape[0]
+    sma20 = np.full(n, np.nan)
+    ema20 = np.full(n, np.nan)
+    rsi14 = np.full(n, np.nan)
+    macd_line = np.full(n, np.nan)
+    signal_line = np.full(n, np.nan)
+    macd_histogram = np.full(n, np.nan)
+    bb_upper = np.full(n, np.nan)
+    bb_lower = np.full(n, np.nan)
+
+    window = 20
+    rsi_window = 14
+    std_dev = 3.0
+    # ewm(span=p, adjust=False) smoothing factors
+    a20 = 2.0 / (20.0 + 1.0)
+    a12 = 2.0 / (12.0 + 1.0)
+    a26 = 2.0 / (26.0 + 1.0)
+    a9 = 2.0 / (9.0 + 1.0)
+
+    s = 0.0
+    s2 = 0.0
+    gain_sum = 0.0
+    loss_sum = 0.0
+    e20 = 0.0
+    e12 = 0.0
+    e26 = 0.0
+    sig = 0.0
+
+    for i in range(n):
+        c = close[i]
+
+        # EWM states (defined from the first bar, like adjust=False)
+        if i == 0:
+            e20 = c
+            e12 = c
+            e26 = c
+            sig = e12 - e26
         else:
-            print(header)
-            print(separator)
-            print(format_header)
-            print(separator)
-        
-        for event in events:
-            date_str = event['date'].strftime('%Y-%m-%d')
-            message = (f"{date_str:<12} {event['type']:<25} {event['price']:<10.2f} "
-                      f"{event['band_value']:<12.2f} {event['deviation']:>8.2f}% {event['description']}")
-            if logger:
-                logger.info(message)
+            e20 = e20 + a20 * (c - e20)
+            e12 = e12 + a12 * (c - e12)
+            e26 = e26 + a26 * (c - e26)
+            sig = sig + a9 * ((e12 - e26) - sig)
+
+        ema20[i] = e20
+        macd_line[i] = e12 - e26
+        signal_line[i] = sig
+        macd_histogram[i] = macd_line[i] - signal_line[i]
+
+        # Rolling sum / sum-of-squares for SMA and Bollinger std
+        s += c
+        s2 += c * c
+        if i >= window:
+            old = close[i - window]
+            s -= old
+            s2 -= old * old
+        if i >= window - 1:
+            mean = s / window
+            var = (s2 - s * s / window) / (window - 1)
+            if var < 1e-10 * mean * mean:
+                d2 = 0.0
+                for j in range(i - window + 1, i + 1):
+                    d = close[j] - mean
+                    d2 += d * d
+                var = d2 / (window - 1)
+            std = np.sqrt(var)
+            sma20[i] = mean
+            bb_upper[i] = mean + std * std_dev
+            bb_lower[i] = mean - std * std_dev
+
+        # Rolling gain/loss sums for RSI
+        if i >= 1:
+            delta = c - close[i - 1]
+            if delta > 0.0:
+                gain_sum += delta
             else:
-=======
-import numpy as np
-import pandas as pd
+                loss_sum -= delta
+            if i > rsi_window:
+                old_delta = close[i - rsi_window] - close[i - rsi_window - 1]
+                if old_delta > 0.0:
+                    gain_sum -= old_delta
+                else:
+                    loss_sum += old_delta
+            if i >= rsi_window:
+                if loss_sum > 0.0:
+                    rs = gain_sum / loss_sum
+                    rsi14[i] = 100.0 - (100.0 / (1.0 + rs))
+                elif gain_sum > 0.0:
+                    rsi14[i] = 100.0
+                # flat window: 0/0 stays NaN, as in the pandas version
+
+    return (sma20, ema20, rsi14, macd_line, signal_line, macd_histogram,
+            bb_upper, bb_lower)
+
+def _bb_w20(close, std_dev):
+    """
+    _fast_bbands specialized for this project's fixed window of 20. With
+    the window a compile-time constant the JIT can fold the loop bounds
+    and fully unroll the recompute loop, which the runtime-window version
+    cannot.
+    """
+    n = close.shape[0]
+    sma = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        c = close[i]
+        s += c
+        s2 += c * c
+        if i >= 20:
+            old = close[i - 20]
+            s -= old
+            s2 -= old * old
+        if i >= 19:
+            mean = s / 20.0
+            var = (s2 - s * s / 20.0) / 19.0
+            if var < 1e-10 * mean * mean:
+                d2 = 0.0
+                for j in range(i - 19, i + 1):
+                    d = close[j] - mean
+                    d2 += d * d
+                var = d2 / 19.0
+            std = np.sqrt(var)
+            sma[i] = mean
+            upper[i] = mean + std * std_dev
+            lower[i] = mean - std * std_dev
+
+    return sma, upper, lower
+
+# Keep the pure-Python kernels importable for aot_build.py
+_fast_bbands_py = _fast_bbands
+_compute_all_py = _compute_all
+_bb_w20_py = _bb_w20
+
+try:
+    # Prefer the ahead-of-time compiled kernels (built by aot_build.py),
+    # which skip the ~1-2s per-process JIT compile on every cold start
+    import ta_kernels as _ta_kernels
+except ImportError:
+    _ta_kernels = None
+
+if _ta_kernels is not None:
+    def _fast_bbands(close, window, std_dev):
+        if close.dtype == np.float32:
+            return _ta_kernels.fast_bbands_f4(np.ascontiguousarray(close),
+                                              window, float(std_dev))
+        return _ta_kernels.fast_bbands_f8(
+            np.ascontiguousarray(close, dtype=np.float64), window, float(std_dev))
+
+    def _compute_all(close):
+        if close.dtype == np.float32:
+            return _ta_kernels.compute_all_f4(np.ascontiguousarray(close))
+        return _ta_kernels.compute_all_f8(
+            np.ascontiguousarray(close, dtype=np.float64))
+
+    if hasattr(_ta_kernels, 'bb_w20_f4'):
+        def _bb_w20(close, std_dev):
+            if close.dtype == np.float32:
+                return _ta_kernels.bb_w20_f4(np.ascontiguousarray(close),
+                                             float(std_dev))
+            return _ta_kernels.bb_w20_f8(
+                np.ascontiguousarray(close, dtype=np.float64), float(std_dev))
+    elif numba is not None:
+        # Extension built before the specialized kernel existed
+        _bb_w20 = numba.njit(cache=True)(_bb_w20)
+elif numba is not None:
+    _fast_bbands = numba.njit(cache=True)(_fast_bbands)
+    _compute_all = numba.njit(cache=True)(_compute_all)
+    _bb_w20 = numba.njit(cache=True)(_bb_w20)
+
+
+def _bbands(close, window, std_dev):
+    """Dispatch to the window-20 specialization when it applies"""
+    if window == 20:
+        return _bb_w20(close, float(std_dev))
+    return _fast_bbands(close, window, float(std_dev))
+
 
 class TechnicalIndicators:
     def __init__(self, data):
@@ -207,67 +265,108 @@ class TechnicalIndicators:
         :param data: DataFrame with columns including ['close']
         """
         self.data = data
-        
+        self._fused = None
+        # Memoized per-parameter results, e.g. bollinger_bands is needed
+        # both for the indicator columns and for crossing detection
+        self._cache = {}
+
+    def _fused_indicators(self):
+        """Run the fused kernel once per instance and cache the arrays"""
+        if self._fused is None:
+            close = self.data['close'].to_numpy()
+            self._fused = _compute_all(close)
+        return self._fused
+
     def sma(self, period=20):
         """
         Simple Moving Average
         """
-        return self.data['close'].rolling(window=period).mean()
-    
+        key = ('sma', period)
+        if key not in self._cache:
+            if period == 20:
+                values = self._fused_indicators()[0]
+            else:
+                close = self.data['close'].to_numpy()
+                values, _, _ = _bbands(close, period, 0.0)
+            self._cache[key] = pd.Series(values, index=self.data.index,
+                                         name='close')
+        return self._cache[key]
+
     def ema(self, period=20):
         """
         Exponential Moving Average
         """
-        return self.data['close'].ewm(span=period, adjust=False).mean()
-    
+        key = ('ema', period)
+        if key not in self._cache:
+            if period == 20:
+                self._cache[key] = pd.Series(self._fused_indicators()[1],
+                                             index=self.data.index, name='close')
+            else:
+                self._cache[key] = self.data['close'].ewm(span=period,
+                                                          adjust=False).mean()
+        return self._cache[key]
+
     def rsi(self, period=14):
         """
         Relative Strength Index
         """
+        if period == 14:
+            return pd.Series(self._fused_indicators()[2], index=self.data.index,
+                             name='close')
         delta = self.data['close'].diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
         loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
+
         rs = gain / loss
         return 100 - (100 / (1 + rs))
-    
+
     def macd(self, fast_period=12, slow_period=26, signal_period=9):
         """
         Moving Average Convergence Divergence
         """
+        if (fast_period, slow_period, signal_period) == (12, 26, 9):
+            fused = self._fused_indicators()
+            return pd.DataFrame({
+                'macd_line': fused[3],
+                'signal_line': fused[4],
+                'macd_histogram': fused[5]
+            }, index=self.data.index)
         fast_ema = self.data['close'].ewm(span=fast_period, adjust=False).mean()
         slow_ema = self.data['close'].ewm(span=slow_period, adjust=False).mean()
         macd_line = fast_ema - slow_ema
         signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
         macd_histogram = macd_line - signal_line
-        
+
         return pd.DataFrame({
             'macd_line': macd_line,
             'signal_line': signal_line,
             'macd_histogram': macd_histogram
         })
-    
+
     def bollinger_bands(self, window=20, std_dev=3):
         """
         Calculate Bollinger Bands
-        
+
         Parameters:
         window (int): The window for moving average, default is 20
         std_dev (int): Number of standard deviations, default is 3
-        
+
         Returns:
         DataFrame with Upper and Lower Bollinger Bands
         """
-        sma = self.data['close'].rolling(window=window).mean()
-        rolling_std = self.data['close'].rolling(window=window).std()
-        
-        upper_band = sma + (rolling_std * std_dev)
-        lower_band = sma - (rolling_std * std_dev)
-        
-        return pd.DataFrame({
-            'BB_Upper': upper_band,
-            'BB_Lower': lower_band
-        })
+        key = ('bb', window, std_dev)
+        if key not in self._cache:
+            if (window, std_dev) == (20, 3):
+                fused = self._fused_indicators()
+                upper_band, lower_band = fused[6], fused[7]
+            else:
+                close = self.data['close'].to_numpy()
+                _, upper_band, lower_band = _bbands(close, window, std_dev)
+            self._cache[key] = pd.DataFrame({
+                'BB_Upper': upper_band,
+                'BB_Lower': lower_band
+            }, index=self.data.index)
+        return self._cache[key]
     
     def stochastic_oscillator(self, period=14):
         """
@@ -292,79 +391,91 @@ class TechnicalIndicators:
         months (int): Number of months to look back (default: 1)
         
         Returns:
-        list: List of dictionaries containing crossing events
+        dict: Parallel arrays describing the crossing events, keyed by
+        'date', 'type', 'price', 'band_value', 'deviation' and the raw
+        'high'/'low'/'open'/'close' prices, most recent first
         """
         # Calculate cutoff date for recent data
         last_date = self.data.index[-1]
         cutoff_date = last_date - pd.DateOffset(months=months)
         
-        # Get recent data
-        recent_data = self.data[self.data.index >= cutoff_date].copy()
-        
-        # Calculate Bollinger Bands if not already done
-        bb_data = self.bollinger_bands()
-        recent_bb = bb_data[bb_data.index >= cutoff_date]
-        
-        events = []
-        
-        # Check each day for price range vs bands
-        for i in range(len(recent_data)):
-            date = recent_data.index[i]
-            
-            # Get daily price range
-            daily_high = recent_data['high'].iloc[i]
-            daily_low = recent_data['low'].iloc[i]
-            daily_open = recent_data['open'].iloc[i]
-            daily_close = recent_data['close'].iloc[i]
-            
-            # Get band values
-            upper_band = recent_bb['BB_Upper'].iloc[i]
-            lower_band = recent_bb['BB_Lower'].iloc[i]
-            
-            # Check upper band
-            if max(daily_high, daily_open, daily_close) > upper_band:
-                max_price = max(daily_high, daily_open, daily_close)
-                deviation = ((max_price - upper_band) / upper_band) * 100
-                events.append({
-                    'date': date,
-                    'type': 'Above upper band',
-                    'price': max_price,
-                    'band_value': upper_band,
-                    'deviation': deviation,
-                    'description': (f"Price range extended above upper 3-sigma band. "
-                                  f"High: {daily_high:.2f}, Open: {daily_open:.2f}, Close: {daily_close:.2f}")
-                })
-            
-            # Check lower band
-            if min(daily_low, daily_open, daily_close) < lower_band:
-                min_price = min(daily_low, daily_open, daily_close)
-                deviation = ((min_price - lower_band) / lower_band) * 100
-                events.append({
-                    'date': date,
-                    'type': 'Below lower band',
-                    'price': min_price,
-                    'band_value': lower_band,
-                    'deviation': deviation,
-                    'description': (f"Price range extended below lower 3-sigma band. "
-                                  f"Low: {daily_low:.2f}, Open: {daily_open:.2f}, Close: {daily_close:.2f}")
-                })
-        
-        # Sort events by date (most recent first)
-        events.sort(key=lambda x: x['date'], reverse=True)
-        
-        return events
+        # Get recent data - the index is sorted by date, so a binary search
+        # plus positional slice avoids the O(N) boolean mask and the copy
+        start = self.data.index.searchsorted(cutoff_date, side='left')
+        recent_data = self.data.iloc[start:]
+
+        window = 20
+        std_dev = 3.0
+        if self._fused is not None:
+            # Bands already computed for the whole history, just slice them
+            upper_bands = self._fused[6][start:]
+            lower_bands = self._fused[7][start:]
+        else:
+            # Only the recent window plus warm-up bars is needed, so roll the
+            # band kernel over that tail instead of the entire history
+            bb_start = max(0, start - (window - 1))
+            close_tail = self.data['close'].to_numpy()[bb_start:]
+            _, upper_tail, lower_tail = _bbands(close_tail, window, std_dev)
+            # Drop the warm-up rows so the band arrays align with recent_data
+            offset = start - bb_start
+            upper_bands = upper_tail[offset:]
+            lower_bands = lower_tail[offset:]
+
+        # Extract price/band columns as plain NumPy arrays once, instead of
+        # paying the pandas .iloc dispatch cost six times per row
+        highs, opens, closes, lows = recent_data[['high', 'open', 'close', 'low']].to_numpy().T
+        dates = recent_data.index
+
+        # Daily price extremes including open/close
+        max_prices = np.maximum(np.maximum(highs, opens), closes)
+        min_prices = np.minimum(np.minimum(lows, opens), closes)
+
+        # Boolean masks for days where the price range escapes the bands
+        # (NaN band values from the warm-up window compare False)
+        above_mask = max_prices > upper_bands
+        below_mask = min_prices < lower_bands
+
+        # Build the events as parallel arrays (structure-of-arrays) instead
+        # of one dict per event - upper crossings first, then lower
+        up_indices = np.flatnonzero(above_mask)
+        down_indices = np.flatnonzero(below_mask)
+        indices = np.concatenate((up_indices, down_indices))
+        types = np.zeros(len(indices), dtype=np.int8)
+        types[len(up_indices):] = EVENT_BELOW_LOWER
+        prices = np.concatenate((max_prices[up_indices], min_prices[down_indices]))
+        bands = np.concatenate((upper_bands[up_indices], lower_bands[down_indices]))
+        deviations = ((prices - bands) / bands) * 100
+
+        # Sort events by date (most recent first) with a stable native
+        # argsort on the int64 timestamps, so an upper crossing stays ahead
+        # of a lower crossing on the same day
+        date_ints = dates.to_numpy()[indices].view(np.int64)
+        order = np.argsort(-date_ints, kind='stable')
+        indices = indices[order]
+
+        return {
+            'date': dates[indices],
+            'type': types[order],
+            'price': prices[order],
+            'band_value': bands[order],
+            'deviation': deviations[order],
+            'high': highs[indices],
+            'low': lows[indices],
+            'open': opens[indices],
+            'close': closes[indices]
+        }
     
     def print_bb_crossings(self, months=2, logger=None):
         """
         Print recent Bollinger Band intersections in a formatted way
         """
         events = self.check_recent_bb_crossings(months)
-        
+
         # Get the date range for the analysis
         last_date = self.data.index[-1].strftime('%Y-%m-%d')
         start_date = (self.data.index[-1] - pd.DateOffset(months=months)).strftime('%Y-%m-%d')
-        
-        if not events:
+
+        if not len(events['date']):
             message = f"\nNo price points outside Bollinger Band (3-sigma) range found between {start_date} and {last_date}"
             if logger:
                 logger.info(message)
@@ -387,12 +498,11 @@ class TechnicalIndicators:
             print(format_header)
             print(separator)
         
-        for event in events:
-            date_str = event['date'].strftime('%Y-%m-%d')
-            message = (f"{date_str:<12} {event['type']:<25} {event['price']:<10.2f} "
-                      f"{event['band_value']:<12.2f} {event['deviation']:>8.2f}% {event['description']}")
+        for i in range(len(events['date'])):
+            date_str = events['date'][i].strftime('%Y-%m-%d')
+            message = (f"{date_str:<12} {EVENT_TYPE_LABELS[events['type'][i]]:<25} {events['price'][i]:<10.2f} "
+                      f"{events['band_value'][i]:<12.2f} {events['deviation'][i]:>8.2f}% {event_description(events, i)}")
             if logger:
                 logger.info(message)
             else:
->>>>>>> e46b2bba6c68a9edac839545b3a5ad8f0efac8b2
                 print(message)
\ No newline at end of file